@@ -13,18 +13,20 @@ LEGEND_ORDER = ["Oracle", "GPT 5", "Gemini 2.5 Pro", "Claude Sonnet 4.5", "Grok
 
 df = pd.read_csv("100_cars_entropy_summary.csv")
 
-present = list(df["model"].unique())
+# One pass over the table; sort=False keeps models in first-appearance order.
+groups = {m: g.sort_values("step") for m, g in df.groupby("model", sort=False)}
+present = list(groups)
 ordered = [m for m in LEGEND_ORDER if m in present] + [m for m in present if m not in LEGEND_ORDER]
 
 plt.figure(figsize=(8, 5))
 for model_name in ordered:
-    g = df[df["model"] == model_name].sort_values("step").copy()
+    g = groups[model_name]
     x = g["step"].to_numpy()
     y = g["entropy_bits_mean"].to_numpy()
     std = g["entropy_bits_std"].to_numpy()
     lower = np.minimum(std, y)
     upper = std
-    yerr = np.vstack([lower, upper])
+    yerr = (lower, upper)
     color = COLOR_MAP.get(model_name, None)
     plt.errorbar(x, y, yerr=yerr, fmt='-o', capsize=3, label=model_name, color=color)
 
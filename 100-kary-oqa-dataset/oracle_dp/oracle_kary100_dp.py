@@ -19,6 +19,14 @@ Usage
    (for example the first 30 keys of the table), run `trajectory_for_target`
    for each one, and average the entropies across targets at every step.
 
+4. The solved DP can be kept between runs. Pass ``memo_path`` to reuse a
+   memo saved earlier for the same table (it is ignored if the table has
+   changed), and save it once it has been filled:
+
+   >>> oracle = KaryOracle(table, memo_path="kary100_memo.json")
+   >>> oracle.solve_all()
+   >>> oracle.save_memo("kary100_memo.json")
+
 The dynamic program assumes:
 * A uniform prior over all objects.
 * Deterministic answers (no observation noise).
@@ -32,125 +40,442 @@ maximizing expected information gain at every step.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from functools import lru_cache
-from math import log2
-from typing import Dict, Iterable, List, Mapping
+import hashlib
+import json
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Tuple
 
+import numpy as np
 
 AttrTable = Mapping[str, Mapping[str, str]]  # object_id -> {attribute: value}
 
+# Expected costs are sums of rational terms, so questions that tie exactly can
+# differ in the last bits depending on summation order. Costs this close are
+# treated as equal and the lowest attribute index wins, as in exact arithmetic.
+_COST_TOL = 1e-9
+
+# (sort key, attribute index, non-empty children, child sizes) for one question.
+_Candidate = Tuple[float, int, List[int], List[int]]
+# mask -> (non-empty children, their popcounts) for one attribute.
+_PartitionFn = Callable[[int], Tuple[List[int], List[int]]]
+
 
-@dataclass(frozen=True)
-class State:
-    """Candidate set of objects, represented by their ids.
+def _partition_counts(
+    attr_codes: np.ndarray,
+    idx: np.ndarray,
+    weights: np.ndarray,
+    offsets: np.ndarray,
+    num_codes: int,
+) -> np.ndarray:
+    """Weighted size of every (attribute, value) bucket of the classes ``idx``.
 
-    We keep the representation as a frozenset of ids so that it can be used
-    as a key in the DP cache.
+    ``offsets[a]`` shifts the value codes of attribute ``a`` so that buckets
+    of different attributes do not collide in the flat result.
     """
+    codes = attr_codes[:, idx] + offsets[:, None]
+    return np.bincount(
+        codes.ravel(),
+        weights=np.broadcast_to(weights, codes.shape).ravel(),
+        minlength=num_codes,
+    )
+
+
+def _compile_partition_fn(val_masks: List[int]) -> _PartitionFn:
+    """Generate ``mask -> (children, sizes)`` for one attribute.
+
+    ``children`` are the non-empty ``mask & M_v`` in value order and
+    ``sizes`` their popcounts. The value masks are baked into the generated
+    source as int literals and the loop over values is unrolled, so the DP
+    partitions and counts a state with one flat call per attribute instead
+    of building the full tuple of children and filtering it afterwards.
+    """
+    body = "".join(
+        f"    c = mask & {vm}\n"
+        "    if c:\n"
+        "        children.append(c)\n"
+        "        sizes.append(c.bit_count())\n"
+        for vm in val_masks
+    )
+    namespace: Dict[str, _PartitionFn] = {}
+    exec(
+        "def _partition(mask):\n"
+        "    children = []\n"
+        "    sizes = []\n"
+        f"{body}"
+        "    return children, sizes\n",
+        namespace,
+    )
+    return namespace["_partition"]
+
+
+def _popcount64_swar(words: np.ndarray) -> np.ndarray:
+    """Per-element population count of a uint64 array (SWAR bit tricks)."""
+    w = words.astype(np.uint64)
+    w = w - ((w >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    w = (w & np.uint64(0x3333333333333333)) + (
+        (w >> np.uint64(2)) & np.uint64(0x3333333333333333)
+    )
+    w = (w + (w >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (w * np.uint64(0x0101010101010101)) >> np.uint64(56)
 
-    ids: frozenset
 
-    def __len__(self) -> int:  # pragma: no cover - trivial
-        return len(self.ids)
+# NumPy >= 2.0 exposes the hardware popcount as a ufunc.
+_popcount64 = getattr(np, "bitwise_count", _popcount64_swar)
 
 
 class KaryOracle:
     """Exact k-ary dynamic program over a finite attribute table.
 
+    Candidate sets are represented as plain integer bitmasks: bit ``c`` is
+    set iff the objects in ``classes[c]`` (one equivalence class of identical
+    attribute vectors) are still candidates. A 100-bit int hashes in a few
+    machine digits, so masks are used directly as keys in the DP memo. The
+    same representation is kept for larger tables: a 1000-bit mask is 34
+    machine digits, hashed in one C pass, and is cheaper to build than a
+    packed ``bytes`` array of the member indices (and, for dense subsets,
+    smaller too).
+
     Parameters
     ----------
     table:
         Dictionary mapping object ids to dictionaries of attribute values.
         The code assumes each object has the same attribute keys and that
         attributes take on finitely many discrete values.
+    memo_path:
+        Optional path of a memo written by ``save_memo``. It is loaded if it
+        exists and was computed for the same table.
     """
 
-    def __init__(self, table: AttrTable):
+    def __init__(
+        self, table: AttrTable, memo_path: str | Path | None = None
+    ):
         if not table:
             raise ValueError("Attribute table must be non-empty.")
-        self.table: Dict[str, Dict[str, str]] = {k: dict(v) for k, v in table.items()}
         # Stable ordering of object ids and attribute names
-        self.object_ids: List[str] = sorted(self.table.keys())
-        self.attributes: List[str] = sorted(next(iter(self.table.values())).keys())
+        self.object_ids: List[str] = sorted(table.keys())
+        self.attributes: List[str] = sorted(next(iter(table.values())).keys())
+        self.object_index: Dict[str, int] = {
+            obj_id: i for i, obj_id in enumerate(self.object_ids)
+        }
+
+        # obj_attr[a, i] is the (sorted) value index of object i under
+        # attribute a. The matrix is attribute-major, so each attribute's
+        # codes across all objects are one contiguous row, and it replaces
+        # the nested dicts entirely: the input table is not kept. One byte
+        # per entry suffices unless an attribute has more than 256 values.
+        columns = [
+            [table[obj_id][attr] for obj_id in self.object_ids]
+            for attr in self.attributes
+        ]
+        self.attr_values: List[List[str]] = [sorted(set(column)) for column in columns]
+        max_values = max((len(values) for values in self.attr_values), default=0)
+        self.obj_attr: np.ndarray = np.empty(
+            (len(self.attributes), len(self.object_ids)),
+            dtype=np.uint8 if max_values <= 256 else np.int16,
+        )
+        for a, (column, values) in enumerate(zip(columns, self.attr_values)):
+            code = {v: j for j, v in enumerate(values)}
+            self.obj_attr[a] = [code[v] for v in column]
+
+        # Objects with identical attribute vectors can never be told apart,
+        # so the DP works on equivalence classes of rows weighted by their
+        # multiplicity. Classes are numbered in order of first appearance.
+        class_index: Dict[bytes, int] = {}
+        self.classes: List[List[str]] = []
+        self.object_class: List[int] = []
+        for i, obj_id in enumerate(self.object_ids):
+            c = class_index.setdefault(self.obj_attr[:, i].tobytes(), len(class_index))
+            if c == len(self.classes):
+                self.classes.append([])
+            self.classes[c].append(obj_id)
+            self.object_class.append(c)
+        self.class_weight: np.ndarray = np.array(
+            [len(members) for members in self.classes], dtype=np.int64
+        )
+        # log2 of every possible candidate count, so trajectories index a
+        # table instead of calling log2 per step (entry 0 is never used).
+        self._log2: List[float] = [0.0] + np.log2(
+            np.arange(1, len(self.object_ids) + 1)
+        ).tolist()
+        # With unique attribute vectors a mask's popcount is its object count.
+        self._unit_weights: bool = len(self.classes) == len(self.object_ids)
+        num_classes = len(self.classes)
+        self.full_mask: int = (1 << num_classes) - 1
+
+        # attr_codes[a, c] is the value index of class c under attribute a.
+        representatives = [self.object_index[members[0]] for members in self.classes]
+        self.attr_codes: np.ndarray = np.ascontiguousarray(
+            self.obj_attr[:, representatives]
+        )
+
+        # attr_val_masks[a][v] has bit c set iff class c takes the v-th value
+        # of attribute a, so partitioning a candidate set is one `&` per
+        # attribute value.
+        self.attr_val_masks: List[List[int]] = []
+        for row, values in zip(self.attr_codes.tolist(), self.attr_values):
+            masks = [0] * len(values)
+            for c, v in enumerate(row):
+                masks[v] |= 1 << c
+            self.attr_val_masks.append(masks)
+        # _part_fns[a](mask) returns the non-empty children of mask under
+        # attribute a and their popcounts in a single call.
+        self._part_fns: List[Callable[[int], Tuple[int, ...]]] = [
+            _compile_partition_fn(masks) for masks in self.attr_val_masks
+        ]
+        self._num_bytes = (num_classes + 7) // 8
+        # Offsets that make (attribute, value) codes unique across attributes,
+        # so one bincount yields the partition sizes of every attribute.
+        self._code_offsets: np.ndarray = np.cumsum(
+            [0] + [len(values) for values in self.attr_values[:-1]]
+        )
+        self._num_codes = sum(len(values) for values in self.attr_values)
+        # Masks as little-endian uint64 words, for stepping many targets at
+        # once; row offsets[a] + v holds the words of attr_val_masks[a][v].
+        self._num_words = (num_classes + 63) // 64
+        val_mask_words = [
+            self._to_words(vm) for masks in self.attr_val_masks for vm in masks
+        ]
+        self._val_mask_words: np.ndarray = (
+            np.stack(val_mask_words)
+            if val_mask_words
+            else np.zeros((0, self._num_words), dtype="<u8")
+        )
+        # DP memo: candidate bitmask -> (optimal expected cost, attribute
+        # index). The DP never evicts, so a plain dict is enough.
+        self._solve_memo: Dict[int, Tuple[float, int]] = {}
+        if memo_path is not None and Path(memo_path).exists():
+            self.load_memo(memo_path)
+
+    def _indices(self, mask: int) -> np.ndarray:
+        """Return the sorted class indices whose bits are set in ``mask``."""
+        raw = np.frombuffer(mask.to_bytes(self._num_bytes, "little"), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+
+    def _to_words(self, mask: int) -> np.ndarray:
+        """Split ``mask`` into little-endian uint64 words."""
+        return np.frombuffer(mask.to_bytes(8 * self._num_words, "little"), dtype="<u8")
+
+    def _target_class(self, target_id: str) -> int:
+        """Equivalence class of a target object id."""
+        if target_id not in self.object_index:
+            raise KeyError(f"Unknown target id: {target_id}")
+        return self.object_class[self.object_index[target_id]]
+
+    def _weight(self, mask: int) -> int:
+        """Number of objects in the classes selected by ``mask``."""
+        if self._unit_weights:
+            return mask.bit_count()
+        return int(self.class_weight[self._indices(mask)].sum())
+
+    def fingerprint(self) -> str:
+        """SHA-256 digest identifying the table the DP memo was computed for."""
+        h = hashlib.sha256()
+        for labels in (self.object_ids, self.attributes, *self.attr_values):
+            h.update("\x1f".join(labels).encode())
+            h.update(b"\x1e")
+        h.update(self.obj_attr.tobytes())
+        return h.hexdigest()
+
+    def save_memo(self, path: str | Path) -> None:
+        """Write the DP memo to ``path`` as JSON, tagged with the table fingerprint.
+
+        Each entry maps a candidate mask (hex string) to its
+        ``[expected_cost, attribute_index]`` pair.
+        """
+        memo = {
+            f"{mask:x}": [cost, attr] for mask, (cost, attr) in self._solve_memo.items()
+        }
+        with Path(path).open("w") as f:
+            json.dump({"fingerprint": self.fingerprint(), "memo": memo}, f)
+
+    def load_memo(self, path: str | Path) -> bool:
+        """Merge a memo written by ``save_memo`` into this oracle.
+
+        Returns False, leaving the memo untouched, if the file is not a valid
+        memo or was written for a different table.
+        """
+        try:
+            with Path(path).open() as f:
+                saved = json.load(f)
+            if not isinstance(saved, dict):
+                return False
+            if saved.get("fingerprint") != self.fingerprint():
+                return False
+            memo = {
+                int(mask, 16): (float(cost), int(attr))
+                for mask, (cost, attr) in saved["memo"].items()
+            }
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return False
+        if any(not -1 <= attr < len(self.attributes) for _, attr in memo.values()):
+            return False
+        self._solve_memo.update(memo)
+        return True
 
     # ---------- Dynamic program over candidate sets ----------
 
-    @lru_cache(maxsize=None)
-    def _cost(self, state: State) -> float:
-        """Expected remaining number of questions from this candidate set.
+    def _popcount_candidates(self, mask: int) -> Tuple[int, List[_Candidate]]:
+        """Candidate questions for ``mask`` when every class holds one object.
+
+        Returns ``(n, candidates)``, where ``n`` is the number of objects in
+        ``mask`` and each candidate is ``(key, attribute, children, sizes)``
+        over the non-empty children of a question that splits ``mask``.
+        Sorting by ``key = sum_v |S_v| log2 |S_v|`` puts the questions with
+        the largest one-step information gain first.
 
-        This is the Bellman-optimal cost function C(S). For a state S and an
-        attribute a, the expected residual cost is
+        The children come straight from the generated partition functions
+        and are sized with ``int.bit_count``, so the whole pass stays in int
+        operations instead of the dozen NumPy calls ``_bincount_candidates``
+        makes per state.
+        """
+        log2 = self._log2
+        n = mask.bit_count()
+        candidates: List[_Candidate] = []
+        for a, partition in enumerate(self._part_fns):
+            children, sizes = partition(mask)
+            if len(children) == 1:
+                continue
+            if len(children) == n:
+                # Every candidate in its own bucket costs exactly 1, the lower
+                # bound for any splittable state, so the lowest such question
+                # is optimal and the others need not be considered.
+                return n, [(0.0, a, children, sizes)]
+            candidates.append((sum(c * log2[c] for c in sizes), a, children, sizes))
+        return n, candidates
+
+    def _bincount_candidates(self, mask: int) -> Tuple[int, List[_Candidate]]:
+        """Candidate questions for ``mask`` on a table with repeated rows.
+
+        Same contract as ``_popcount_candidates``, but sizes count each class
+        by its multiplicity, so they come from one weighted bincount over
+        every (attribute, value) pair.
+        """
+        idx = self._indices(mask)
+        weights = self.class_weight[idx]
+        n = int(weights.sum())
+        counts = _partition_counts(
+            self.attr_codes, idx, weights, self._code_offsets, self._num_codes
+        )
+
+        # Non-empty buckets are found once for all attributes, not searched
+        # attribute by attribute.
+        nonzero = counts > 0
+        buckets = np.add.reduceat(nonzero, self._code_offsets)
+
+        # A question that puts every remaining class in its own bucket costs
+        # exactly 1, the lower bound for any splittable state, so the lowest
+        # such attribute is the only candidate worth returning.
+        separating = np.flatnonzero(buckets == len(idx))
+        if len(separating):
+            splits = separating[:1]
+        else:
+            # An attribute with a single non-empty bucket carries no
+            # information and is dropped.
+            splits = np.flatnonzero(buckets > 1)
+
+        # sum_v p(v) log2 p(v) is minus the one-step information gain.
+        p = counts / n
+        plogp = p * np.log2(p, where=nonzero, out=np.zeros_like(p))
+        neg_gains = np.add.reduceat(plogp, self._code_offsets).tolist()
+        # Sizes of all non-empty buckets in code order; attribute a owns the
+        # buckets[a] entries ending at ends[a].
+        sizes = counts[nonzero].tolist()
+        ends = np.cumsum(buckets).tolist()
+        candidates: List[_Candidate] = []
+        for a in splits.tolist():
+            # The partition function yields the same non-empty buckets, in
+            # value order; only their sizes need the class weights.
+            children, _ = self._part_fns[a](mask)
+            hi = ends[a]
+            candidates.append(
+                (neg_gains[a], a, children, sizes[hi - len(children) : hi])
+            )
+        return n, candidates
+
+    def _solve(self, mask: int) -> Tuple[float, int]:
+        """Return ``(expected_cost, best_attribute_index)`` for a candidate set.
+
+        The cost is the Bellman-optimal cost function C(S). For a state S and
+        an attribute a, the expected residual cost is
 
             C_a(S) = 1 + sum_{v in values(a)} p(v | S) * C(S_v)
 
         where S_v is the subset of objects in S whose attribute a equals v.
-        The oracle chooses the attribute a that minimizes C_a(S).
+        The oracle chooses the attribute a that minimizes C_a(S), and its
+        index into ``self.attributes`` is returned alongside the cost.
 
-        When no attribute produces a non-trivial split we return 0, meaning
-        that further querying cannot reduce the candidate set.
+        When no attribute produces a non-trivial split we return ``(0.0, -1)``,
+        meaning that further querying cannot reduce the candidate set.
         """
-        ids = state.ids
-        n = len(ids)
-        if n <= 1:
-            return 0.0
+        if mask & (mask - 1) == 0:
+            # At most one equivalence class left: nothing can be split.
+            return 0.0, -1
+        cached = self._solve_memo.get(mask)
+        if cached is not None:
+            return cached
+
+        if self._unit_weights:
+            n, candidates = self._popcount_candidates(mask)
+        else:
+            n, candidates = self._bincount_candidates(mask)
+        # Most informative questions first, so that best_cost tightens early.
+        candidates.sort()
 
         best_cost = float("inf")
-        # Try every attribute as the next question.
-        for attr in self.attributes:
-            # Partition the candidate set by this attribute's values.
-            partitions: Dict[str, set] = {}
-            for obj_id in ids:
-                val = self.table[obj_id][attr]
-                partitions.setdefault(val, set()).add(obj_id)
-            # Skip attributes that do not split the set.
-            if len(partitions) <= 1:
-                continue
-
+        best_attr = -1
+        for _, a, children, sizes in candidates:
             expected = 1.0  # cost of asking this question
-            for subset in partitions.values():
-                sub_state = State(frozenset(subset))
-                expected += (len(subset) / n) * self._cost(sub_state)
-
-            if expected < best_cost:
-                best_cost = expected
-
-        if best_cost == float("inf"):
+            for child, c in zip(children, sizes):
+                # Child costs are non-negative, so the partial sum is a lower
+                # bound on C_a(S). Ties go to the lowest attribute index.
+                if expected > best_cost + _COST_TOL or (
+                    expected >= best_cost - _COST_TOL and a > best_attr
+                ):
+                    break
+                expected += (c / n) * self._solve(child)[0]
+            else:
+                if expected < best_cost - _COST_TOL or (
+                    expected <= best_cost + _COST_TOL and a < best_attr
+                ):
+                    best_cost = expected
+                    best_attr = a
+
+        if best_attr == -1:
             # No attribute can split this candidate set any further.
-            return 0.0
-        return best_cost
-
-    def _best_attribute(self, state: State) -> str | None:
-        """Return the optimal attribute to query at this state, or None."""
-        ids = state.ids
-        n = len(ids)
-        if n <= 1:
-            return None
+            best_cost = 0.0
+        result = (best_cost, best_attr)
+        self._solve_memo[mask] = result
+        return result
 
-        best_cost = float("inf")
-        best_attr: str | None = None
-
-        for attr in self.attributes:
-            partitions: Dict[str, set] = {}
-            for obj_id in ids:
-                val = self.table[obj_id][attr]
-                partitions.setdefault(val, set()).add(obj_id)
-            if len(partitions) <= 1:
-                continue
-
-            expected = 1.0
-            for subset in partitions.values():
-                sub_state = State(frozenset(subset))
-                expected += (len(subset) / n) * self._cost(sub_state)
+    # ---------- Public API ----------
 
-            if expected < best_cost:
-                best_cost = expected
-                best_attr = attr
+    def solve_all(self, root_mask: int | None = None) -> float:
+        """Fill the DP memo for every state reachable from ``root_mask``.
 
-        return best_attr
+        Reachable candidate sets are discovered breadth-first and then solved
+        in order of increasing size, so every child is already memoized when
+        its parent is evaluated and ``_solve`` never recurses more than one
+        level. Returns the optimal expected cost from ``root_mask`` (the full
+        candidate set by default).
+        """
+        if root_mask is None:
+            root_mask = self.full_mask
+        seen = {root_mask}
+        queue = deque([root_mask])
+        while queue:
+            mask = queue.popleft()
+            if mask & (mask - 1) == 0 or mask in self._solve_memo:
+                continue
+            for partition in self._part_fns:
+                for sub in partition(mask)[0]:
+                    if sub != mask and sub not in seen:
+                        seen.add(sub)
+                        queue.append(sub)
 
-    # ---------- Public API ----------
+        for mask in sorted(seen, key=int.bit_count):
+            self._solve(mask)
+        return self._solve(root_mask)[0]
 
     def trajectory_for_target(self, target_id: str, max_steps: int = 10) -> List[float]:
         """Return posterior entropies for a particular target object.
@@ -160,57 +485,81 @@ class KaryOracle:
         optimal policy. Once the candidate set collapses to size 1, all
         subsequent entropies are exactly 0.0.
         """
-        if target_id not in self.table:
-            raise KeyError(f"Unknown target id: {target_id}")
-
-        current_ids = set(self.object_ids)
+        # The target's answer to every question, looked up once.
+        target_class = self._target_class(target_id)
+        target_values = self.attr_codes[:, target_class].tolist()
+        attr_val_masks = self.attr_val_masks
+        log2_table = self._log2
+        current_mask = self.full_mask
         entropies: List[float] = []
 
         for _ in range(max_steps):
-            if len(current_ids) <= 1:
-                entropies.append(0.0)
-                continue
+            _, attr_idx = self._solve(current_mask)
+            if attr_idx == -1:
+                # A single equivalence class remains and no attribute can
+                # split it; the candidate set will not change any more.
+                break
 
-            state = State(frozenset(current_ids))
-            attr = self._best_attribute(state)
-            if attr is None:
-                # No attribute can split the remaining candidates.
-                entropies.append(0.0)
-                continue
-
-            target_value = self.table[target_id][attr]
             # Update the candidate set to those objects matching the answer.
-            current_ids = {
-                obj_id
-                for obj_id in current_ids
-                if self.table[obj_id][attr] == target_value
-            }
-            entropies.append(log2(len(current_ids)))
+            current_mask &= attr_val_masks[attr_idx][target_values[attr_idx]]
+            entropies.append(log2_table[self._weight(current_mask)])
 
+        entropies.extend([0.0] * (max_steps - len(entropies)))
         return entropies
 
     def mean_trajectory(
         self, target_ids: Iterable[str], max_steps: int = 10
     ) -> List[float]:
-        """Average entropy trajectory over a collection of target ids."""
-        trajectories = [
-            self.trajectory_for_target(obj_id, max_steps=max_steps)
-            for obj_id in target_ids
-        ]
-        # Transpose to step-major layout and average.
-        num_targets = len(trajectories)
+        """Average entropy trajectory over a collection of target ids.
+
+        All targets are stepped together: each step solves every *distinct*
+        current candidate set once, then narrows all targets' masks with a
+        single gather-and-AND over their uint64 word arrays.
+        """
+        target_classes = np.array(
+            [self._target_class(obj_id) for obj_id in target_ids], dtype=np.intp
+        )
+        num_targets = len(target_classes)
         if num_targets == 0:
             raise ValueError("mean_trajectory requires at least one target id.")
-        return [
-            sum(traj[t] for traj in trajectories) / num_targets
-            for t in range(max_steps)
-        ]
 
+        masks = np.tile(self._to_words(self.full_mask), (num_targets, 1))
+        totals = np.zeros(max(max_steps, 0))
+        for t in range(max_steps):
+            # Viewing each row as one opaque record makes np.unique a 1-D sort;
+            # the records come back as the little-endian bytes of each mask.
+            unique_masks, inverse = np.unique(
+                masks.view(f"V{8 * self._num_words}").ravel(), return_inverse=True
+            )
+            attrs = np.array(
+                [
+                    self._solve(int.from_bytes(raw, "little"))[1]
+                    for raw in unique_masks.tolist()
+                ]
+            )[inverse]
+            active = attrs != -1
+            if not active.any():
+                # Every target is down to an unsplittable class.
+                break
+            # Each target's answer selects row offsets[a] + value of the
+            # value-mask table; finished targets keep their mask.
+            attrs = attrs[active]
+            values = self.attr_codes[attrs, target_classes[active]]
+            answers = self._code_offsets[attrs] + values
+            masks[active] &= self._val_mask_words[answers]
+            if self._unit_weights:
+                counts = _popcount64(masks[active]).sum(axis=1)
+            else:
+                bits = np.unpackbits(
+                    masks[active].view(np.uint8), axis=1, bitorder="little"
+                )[:, : len(self.classes)]
+                counts = bits @ self.class_weight
+            totals[t] = np.log2(counts).sum()
+
+        return (totals / num_targets).tolist()
 
-if __name__ == "__main__":  # simple smoke test
-    import json
-    from pathlib import Path
 
+if __name__ == "__main__":  # simple smoke test
     data_path = (
         Path(__file__).resolve().parent.parent / "data" / "oqa_kary100_dataset.json"
     )
@@ -219,7 +568,7 @@ if __name__ == "__main__":  # simple smoke test
 
     oracle = KaryOracle(table)
     print("Expected optimal cost from root:",
-          oracle._cost(State(frozenset(oracle.object_ids))))
+          oracle._solve(oracle.full_mask)[0])
 
     # Example: entropy trajectory for the first object id
     first_id = oracle.object_ids[0]
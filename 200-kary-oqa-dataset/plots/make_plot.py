@@ -13,11 +13,15 @@ colors = {
 }
 
 df = pd.read_csv("kary200_entropy_summary.csv")
+# One pass over the table instead of one boolean scan per model.
+groups = {m: g.sort_values("step") for m, g in df.groupby("model", sort=False)}
 
 plt.figure(figsize=(9, 5))
 
 for model in order:
-    g = df[df["model"] == model].sort_values("step")
+    g = groups.get(model)
+    if g is None:
+        continue
     x = g["step"].to_numpy()
     y = g["entropy_bits_mean"].to_numpy()
     std = g["entropy_bits_std"].to_numpy()
@@ -26,7 +30,7 @@ for model in order:
     # lower bar so it never implies negative entropy.
     lower = np.minimum(std, y)
     upper = std
-    yerr = np.vstack([lower, upper])
+    yerr = (lower, upper)
 
     plt.errorbar(
         x,
@@ -15,11 +15,13 @@ colors = {
 }
 
 df = pd.read_csv("kary300_entropy_summary.csv")
+# One pass over the table instead of one boolean scan per model.
+groups = {m: g.sort_values("step") for m, g in df.groupby("model", sort=False)}
 
 plt.figure(figsize=(9, 5))
 for model in order:
-    g = df[df["model"] == model].sort_values("step")
-    if g.empty:
+    g = groups.get(model)
+    if g is None:
         continue
     x = g["step"].to_numpy()
     y = g["entropy_bits_mean"].to_numpy()
@@ -28,7 +30,7 @@ for model in order:
     # Use mean ± std, but do not go below zero
     lower = np.minimum(std, y)
     upper = std
-    yerr = np.vstack([lower, upper])
+    yerr = (lower, upper)
 
     plt.errorbar(
         x,